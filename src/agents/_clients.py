@@ -0,0 +1,106 @@
+"""Shared Azure credentials and project clients for the agent scripts.
+
+DefaultAzureCredential probes several credential sources before it settles
+on one, and each instance keeps its own token cache. Handing out a single
+credential and one project client per endpoint lets every call in the
+process reuse the same token and connection pool.
+"""
+
+import functools
+
+import httpx
+from azure.ai.projects.aio import AIProjectClient
+from azure.identity import DefaultAzureCredential
+from azure.identity.aio import DefaultAzureCredential as AsyncDefaultAzureCredential
+from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+
+_project_clients: dict = {}
+_openai_clients: dict = {}
+
+
+@functools.lru_cache(maxsize=None)
+def get_credential() -> DefaultAzureCredential:
+    """Sync credential, for SDKs such as RedTeam that expect a TokenCredential."""
+    return DefaultAzureCredential(exclude_visual_studio_code_credential=True)
+
+
+@functools.lru_cache(maxsize=None)
+def get_async_credential() -> AsyncDefaultAzureCredential:
+    return AsyncDefaultAzureCredential(exclude_visual_studio_code_credential=True)
+
+
+@functools.lru_cache(maxsize=None)
+def get_http_client() -> httpx.AsyncClient:
+    """HTTP/2 transport shared by every OpenAI client.
+
+    Calls to the same host multiplex over a few kept-alive connections
+    instead of each client paying for its own TLS handshakes. Built on the
+    openai default client so its other transport defaults, such as
+    following redirects, still apply.
+    """
+    return DefaultAsyncHttpxClient(
+        http2=True,
+        # Same overall timeout as the openai default; agent runs can be slow
+        timeout=httpx.Timeout(600.0, connect=5.0, pool=10.0),
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60),
+    )
+
+
+def make_polling_http_client() -> httpx.Client:
+    """Sync transport for OpenAI clients that poll eval runs.
+
+    httpx drops idle connections after 5 s by default, which is shorter than
+    the backoff between polls, so every retrieve would need a new TLS
+    handshake. Keeping them for 60 s lets one connection serve the whole wait.
+    The returned client is closed along with the OpenAI client it is given to.
+    """
+    return DefaultHttpxClient(
+        timeout=httpx.Timeout(600.0, connect=5.0, pool=10.0),
+        # The openai default limits, plus the longer keepalive
+        limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100, keepalive_expiry=60),
+    )
+
+
+def get_project_client(endpoint: str) -> AIProjectClient:
+    """Async AIProjectClient for ``endpoint``, created once and then reused."""
+    client = _project_clients.get(endpoint)
+    if client is None:
+        client = _project_clients[endpoint] = AIProjectClient(
+            endpoint=endpoint,
+            credential=get_async_credential(),
+            retry_total=3,
+            retry_backoff_factor=0.5,
+        )
+    return client
+
+
+def get_openai_client(endpoint: str):
+    """Async OpenAI client for the project at ``endpoint`` on the shared transport."""
+    client = _openai_clients.get(endpoint)
+    if client is None:
+        client = _openai_clients[endpoint] = get_project_client(endpoint).get_openai_client(
+            http_client=get_http_client()
+        )
+    return client
+
+
+async def close_clients() -> None:
+    """Close every shared async client; must run before the event loop exits."""
+    _openai_clients.clear()
+    for client in _project_clients.values():
+        await client.close()
+    _project_clients.clear()
+    if get_http_client.cache_info().currsize:
+        await get_http_client().aclose()
+        get_http_client.cache_clear()
+    if get_async_credential.cache_info().currsize:
+        await get_async_credential().close()
+        get_async_credential.cache_clear()
+
+
+async def run_and_close(coro):
+    """Await ``coro`` and then close the shared clients, for use with asyncio.run."""
+    try:
+        return await coro
+    finally:
+        await close_clients()
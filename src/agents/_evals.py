@@ -0,0 +1,39 @@
+"""Helpers for waiting on Azure AI evaluation runs.
+
+These work with the OpenAI client returned by the sync
+``AIProjectClient.get_openai_client()``.
+"""
+
+import logging
+import random
+import time
+
+log = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({"completed", "failed", "canceled"})
+
+
+def _poll_delays(poll_interval: float, max_delay: float):
+    """Yield capped exponential backoff delays with +/-20% jitter.
+
+    Short runs are picked up within a second or two while long runs settle
+    at one retrieve every ``max_delay`` seconds.
+    """
+    attempt = 0
+    while True:
+        yield min(max_delay, poll_interval * 2**attempt) * random.uniform(0.8, 1.2)
+        attempt += 1
+
+
+def wait_for_completion(client, eval_id: str, run_id: str, poll_interval: float = 1, max_delay: float = 30):
+    """Block until the eval run reaches a terminal status and return it.
+
+    ``poll_interval`` is the first delay between retrieves; later delays
+    double up to ``max_delay``.
+    """
+    for delay in _poll_delays(poll_interval, max_delay):
+        run = client.evals.runs.retrieve(run_id=run_id, eval_id=eval_id)
+        if run.status in TERMINAL_STATUSES:
+            return run
+        time.sleep(delay)
+        log.info("Waiting for eval run to complete... %s", run.status)
@@ -0,0 +1,37 @@
+"""Environment configuration for the agent scripts, resolved once at import."""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    azure_ai_project: Optional[str]
+    azure_ai_project_endpoint: Optional[str]
+    azure_openai_endpoint: Optional[str]
+    azure_openai_key: Optional[str]
+    azure_openai_api_version: Optional[str]
+    azure_openai_deployment: Optional[str]
+
+    @classmethod
+    def load(cls) -> "Settings":
+        """Read settings from the environment, loading ``.env`` first.
+
+        Missing values are left as ``None`` rather than raising, so scripts
+        that don't use a setting can still be imported without it.
+        """
+        load_dotenv()
+        return cls(
+            azure_ai_project=os.getenv("AZURE_AI_PROJECT"),
+            azure_ai_project_endpoint=os.getenv("AZURE_AI_PROJECT_ENDPOINT"),
+            azure_openai_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+            azure_openai_key=os.getenv("AZURE_OPENAI_KEY"),
+            azure_openai_api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+            azure_openai_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT"),
+        )
+
+
+SETTINGS = Settings.load()
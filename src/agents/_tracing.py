@@ -0,0 +1,67 @@
+"""Tracer provider bootstrap shared by the agent scripts.
+
+Spans are handed to a BatchSpanProcessor so exports run on a background
+thread instead of blocking each request on an HTTP round trip.
+"""
+
+import logging
+import os
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+logger = logging.getLogger(__name__)
+
+_initialized = False
+# These are single-run scripts that print their trace id for lookup, so keep
+# every trace by default; lower OTEL_TRACES_SAMPLER_ARG for bulk runs.
+_DEFAULT_SAMPLE_RATIO = 1.0
+
+
+def _get_span_exporter():
+    connection_string = os.getenv("APPLICATIONINSIGHTS_CONNECTION_STRING")
+    if connection_string:
+        from azure.monitor.opentelemetry.exporter import AzureMonitorTraceExporter
+
+        try:
+            return AzureMonitorTraceExporter(connection_string=connection_string)
+        except ValueError as e:
+            # e.g. the sample.env placeholder; telemetry is optional, so carry on without it
+            logger.warning("Ignoring invalid APPLICATIONINSIGHTS_CONNECTION_STRING, spans will not be exported: %s", e)
+            return None
+    if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        try:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            return None
+        return OTLPSpanExporter()
+    return None
+
+
+def init_tracing() -> None:
+    """Install a batching, head-sampled tracer provider once per process.
+
+    Must run before the first ``get_tracer()`` call so spans are created
+    against this provider rather than the default no-op one.
+    """
+    global _initialized
+    if _initialized:
+        return
+    _initialized = True
+
+    # Head sampling: unsampled traces never reach the span processor.
+    ratio = float(os.getenv("OTEL_TRACES_SAMPLER_ARG", _DEFAULT_SAMPLE_RATIO))
+    provider = TracerProvider(sampler=ParentBased(TraceIdRatioBased(ratio)))
+    exporter = _get_span_exporter()
+    if exporter is not None:
+        provider.add_span_processor(
+            BatchSpanProcessor(
+                exporter,
+                max_queue_size=4096,
+                schedule_delay_millis=5000,
+                max_export_batch_size=512,
+            )
+        )
+    trace.set_tracer_provider(provider)
@@ -1,7 +1,8 @@
 from dotenv import load_dotenv
+import logging
 import os
+import sys
 import json
-import time
 from pprint import pprint
 from azure.identity import DefaultAzureCredential
 from azure.ai.projects import AIProjectClient
@@ -11,8 +12,14 @@ from openai.types.evals.create_eval_jsonl_run_data_source_param import (
     SourceFileContentContent,
 )
 
+from _clients import make_polling_http_client
+from _evals import wait_for_completion
+
 
 load_dotenv()
+# Show eval-run progress from the polling helpers without enabling Azure SDK INFO logs
+logging.basicConfig(format="%(message)s", stream=sys.stdout)
+logging.getLogger("_evals").setLevel(logging.INFO)
 
 
 endpoint = os.environ[
@@ -20,13 +27,173 @@ endpoint = os.environ[
 ]  # Sample : https://<account_name>.services.ai.azure.com/api/projects/<project_name>
 model_deployment_name = os.environ.get("AZURE_AI_MODEL_DEPLOYMENT_NAME", "")  # Sample : gpt-4o-mini
 
+
+# Evaluator templates in the order they run: name -> (evaluator_name, data_mapping fields)
+_EVALUATOR_TEMPLATES = {
+    # System Evaluation
+    "task_completion": ("builtin.task_completion", ("query", "response", "tool_definitions")),
+    "task_adherence": ("builtin.task_adherence", ("query", "response", "tool_definitions")),
+    "intent_resolution": ("builtin.intent_resolution", ("query", "response", "tool_definitions")),
+    # RAG Evaluation
+    "groundedness": ("builtin.groundedness", ("query", "tool_definitions", "response")),
+    "relevance": ("builtin.relevance", ("query", "response")),
+    # Process Evaluation
+    "tool_call_accuracy": ("builtin.tool_call_accuracy", ("query", "tool_definitions", "tool_calls", "response")),
+    "tool_selection": ("builtin.tool_selection", ("query", "response", "tool_calls", "tool_definitions")),
+    "tool_input_accuracy": ("builtin.tool_input_accuracy", ("query", "response", "tool_definitions")),
+    "tool_output_utilization": ("builtin.tool_output_utilization", ("query", "response", "tool_definitions")),
+    # "tool_success": ("builtin.tool_success", ("tool_definitions", "response")),
+}
+_STANDARD_ORDER = tuple(_EVALUATOR_TEMPLATES)
+_COMMON_MAPPING = {field: f"{{{{item.{field}}}}}" for field in ("query", "response", "tool_definitions", "tool_calls")}
+
+
+def _build_criterion(name: str, deployment_name: str, is_reasoning_model: bool) -> dict:
+    evaluator_name, fields = _EVALUATOR_TEMPLATES[name]
+    initialization_parameters = {"deployment_name": deployment_name}
+    if is_reasoning_model:
+        # only for AOAI reasoning models
+        initialization_parameters["is_reasoning_model"] = True
+    return {
+        "type": "azure_ai_evaluator",
+        "name": name,
+        "evaluator_name": evaluator_name,
+        "initialization_parameters": initialization_parameters,
+        "data_mapping": {field: _COMMON_MAPPING[field] for field in fields},
+    }
+
+
+def _get_testing_criteria(deployment_name: str, is_reasoning_model: bool = False) -> list:
+    """Build the agent quality testing criteria for ``deployment_name``.
+
+    Every criterion is a fresh dict with its own nested mappings.
+    """
+    return [_build_criterion(name, deployment_name, is_reasoning_model) for name in _STANDARD_ORDER]
+
+
+_SAMPLE_QUERY = [
+    # system message is required for task adherence evaluator to examine agent instructions
+    {"role": "system", "content": "You are a weather report agent."},
+    # (optional) prior conversation messages may be included as context for better evaluation accuracy
+    # user message with tool use request
+    {
+        "createdAt": "2025-03-14T08:00:00Z",
+        "role": "user",
+        "content": [
+            {
+                "type": "text",
+                "text": "Can you send me an email at your_email@example.com with weather information for Seattle?"
+            }
+        ],
+    },
+]
+
+# agent's response with tool calls and tool results to resolve the user request
+_SAMPLE_RESPONSE = [
+    {
+        "createdAt": "2025-03-26T17:27:35Z",
+        "run_id": "run_zblZyGCNyx6aOYTadmaqM4QN",
+        "role": "assistant",
+        "content": [
+            {
+                "type": "tool_call",
+                "tool_call_id": "call_CUdbkBfvVBla2YP3p24uhElJ",
+                "name": "fetch_weather",
+                "arguments": {"location": "Seattle"},
+            }
+        ],
+    },
+    {
+        "createdAt": "2025-03-26T17:27:37Z",
+        "run_id": "run_zblZyGCNyx6aOYTadmaqM4QN",
+        "tool_call_id": "call_CUdbkBfvVBla2YP3p24uhElJ",
+        "role": "tool",
+        "content": [{"type": "tool_result", "tool_result": {"weather": "Rainy, 14\u00b0C"}}],
+    },
+    {
+        "createdAt": "2025-03-26T17:27:38Z",
+        "run_id": "run_zblZyGCNyx6aOYTadmaqM4QN",
+        "role": "assistant",
+        "content": [
+            {
+                "type": "tool_call",
+                "tool_call_id": "call_iq9RuPxqzykebvACgX8pqRW2",
+                "name": "send_email",
+                "arguments": {
+                    "recipient": "your_email@example.com",
+                    "subject": "Weather Information for Seattle",
+                    "body": "The current weather in Seattle is rainy with a temperature of 14\u00b0C.",
+                },
+            }
+        ],
+    },
+    {
+        "createdAt": "2025-03-26T17:27:41Z",
+        "run_id": "run_zblZyGCNyx6aOYTadmaqM4QN",
+        "tool_call_id": "call_iq9RuPxqzykebvACgX8pqRW2",
+        "role": "tool",
+        "content": [
+            {
+                "type": "tool_result",
+                "tool_result": {"message": "Email successfully sent to your_email@example.com."},
+            }
+        ],
+    },
+    {
+        "createdAt": "2025-03-26T17:27:42Z",
+        "run_id": "run_zblZyGCNyx6aOYTadmaqM4QN",
+        "role": "assistant",
+        "content": [
+            {
+                "type": "text",
+                "text": "I have successfully sent you an email with the weather information for Seattle. The current weather is rainy with a temperature of 14\u00b0C.",
+            }
+        ],
+    },
+]
+
+# tool definitions: schema of tools available to the agent
+_SAMPLE_TOOL_DEFINITIONS = [
+    {
+        "name": "fetch_weather",
+        "description": "Fetches the weather information for the specified location.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "location": {"type": "string", "description": "The location to fetch weather for."}
+            },
+        },
+    },
+    {
+        "name": "send_email",
+        "description": "Sends an email with the specified subject and body to the recipient.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "recipient": {"type": "string", "description": "Email address of the recipient."},
+                "subject": {"type": "string", "description": "Subject of the email."},
+                "body": {"type": "string", "description": "Body content of the email."},
+            },
+        },
+    }
+]
+
+# Sample weather agent conversation used as the inline eval data; shared and read-only
+_SAMPLE_ITEM = {
+    "query": _SAMPLE_QUERY,
+    "tool_definitions": _SAMPLE_TOOL_DEFINITIONS,
+    "response": _SAMPLE_RESPONSE,
+    "tool_calls": None,  # only needed for tool-focused evaluators if separate from response
+}
+
+
 with DefaultAzureCredential() as credential:
     with AIProjectClient(
         endpoint=endpoint, credential=credential
     ) as project_client:
         print("Creating an OpenAI client from the AI Project client")
 
-        client = project_client.get_openai_client()
+        client = project_client.get_openai_client(http_client=make_polling_http_client())
 
         data_source_config = {
             "type": "custom",
@@ -45,162 +212,7 @@ with DefaultAzureCredential() as credential:
             "include_sample_schema": True,
         }
 
-        testing_criteria = [
-            # System Evaluation
-            # 1. Task Completion
-            {
-                "type": "azure_ai_evaluator",
-                "name": "task_completion",
-                "evaluator_name": "builtin.task_completion",
-                "initialization_parameters": {
-                    "deployment_name": f"{model_deployment_name}",
-                    # "is_reasoning_model": True # if you use an AOAI reasoning model
-                },
-                "data_mapping": {
-                    "query": "{{item.query}}",
-                    "response": "{{item.response}}",
-                    "tool_definitions": "{{item.tool_definitions}}",
-                },
-            },
-            # 2. Task Adherence
-            {
-                "type": "azure_ai_evaluator",
-                "name": "task_adherence",
-                "evaluator_name": "builtin.task_adherence",
-                "initialization_parameters": {
-                    "deployment_name": f"{model_deployment_name}",
-                    # "is_reasoning_model": True # if you use an AOAI reasoning model
-                },
-                "data_mapping": {
-                    "query": "{{item.query}}",
-                    "response": "{{item.response}}",
-                    "tool_definitions": "{{item.tool_definitions}}",
-                },
-            },
-            # 3. Intent Resolution
-            {
-                "type": "azure_ai_evaluator",
-                "name": "intent_resolution",
-                "evaluator_name": "builtin.intent_resolution",
-                "initialization_parameters": {
-                    "deployment_name": f"{model_deployment_name}",
-                    # "is_reasoning_model": True # if you use an AOAI reasoning model
-                },
-                "data_mapping": {
-                    "query": "{{item.query}}",
-                    "response": "{{item.response}}",
-                    "tool_definitions": "{{item.tool_definitions}}",
-                },
-            },
-            # RAG Evaluation
-            # 4. Groundedness
-            {
-                "type": "azure_ai_evaluator",
-                "name": "groundedness",
-                "evaluator_name": "builtin.groundedness",
-                "initialization_parameters": {
-                    "deployment_name": f"{model_deployment_name}",
-                    # "is_reasoning_model": True # if you use an AOAI reasoning model
-                },
-                "data_mapping": {
-                    "query": "{{item.query}}",
-                    "tool_definitions": "{{item.tool_definitions}}",
-                    "response": "{{item.response}}",
-                },
-            },
-            # 5. Relevance
-            {
-                "type": "azure_ai_evaluator",
-                "name": "relevance",
-                "evaluator_name": "builtin.relevance",
-                "initialization_parameters": {
-                    "deployment_name": f"{model_deployment_name}",
-                    # "is_reasoning_model": True # if you use an AOAI reasoning model
-                },
-                "data_mapping": {
-                    "query": "{{item.query}}",
-                    "response": "{{item.response}}",
-                },
-            },
-            # Process Evaluation
-            # 1. Tool Call Accuracy
-            {
-                "type": "azure_ai_evaluator",
-                "name": "tool_call_accuracy",
-                "evaluator_name": "builtin.tool_call_accuracy",
-                "initialization_parameters": {
-                    "deployment_name": f"{model_deployment_name}",
-                    # "is_reasoning_model": True # if you use an AOAI reasoning model
-                },
-                "data_mapping": {
-                    "query": "{{item.query}}",
-                    "tool_definitions": "{{item.tool_definitions}}",
-                    "tool_calls": "{{item.tool_calls}}",
-                    "response": "{{item.response}}",
-                },
-            },
-            # 2. Tool Selection
-            {
-                "type": "azure_ai_evaluator",
-                "name": "tool_selection",
-                "evaluator_name": "builtin.tool_selection",
-                "initialization_parameters": {
-                    "deployment_name": f"{model_deployment_name}",
-                    # "is_reasoning_model": True # if you use an AOAI reasoning model
-                },
-                "data_mapping": {
-                    "query": "{{item.query}}",
-                    "response": "{{item.response}}",
-                    "tool_calls": "{{item.tool_calls}}",
-                    "tool_definitions": "{{item.tool_definitions}}",
-                },
-            },
-            # 3. Tool Input Accuracy
-            {
-                "type": "azure_ai_evaluator",
-                "name": "tool_input_accuracy",
-                "evaluator_name": "builtin.tool_input_accuracy",
-                "initialization_parameters": {
-                    "deployment_name": f"{model_deployment_name}",
-                    # "is_reasoning_model": True # if you use an AOAI reasoning model
-                },
-                "data_mapping": {
-                    "query": "{{item.query}}",
-                    "response": "{{item.response}}",
-                    "tool_definitions": "{{item.tool_definitions}}",
-                },
-            },
-            # 4. Tool Output Utilization
-            {
-                "type": "azure_ai_evaluator",
-                "name": "tool_output_utilization",
-                "evaluator_name": "builtin.tool_output_utilization",
-                "initialization_parameters": {
-                    "deployment_name": f"{model_deployment_name}",
-                    # "is_reasoning_model": True # if you use an AOAI reasoning model
-                },
-                "data_mapping": {
-                    "query": "{{item.query}}",
-                    "response": "{{item.response}}",
-                    "tool_definitions": "{{item.tool_definitions}}",
-                },
-            },
-            # # 5. Tool Call Success
-            # {
-            #     "type": "azure_ai_evaluator",
-            #     "name": "tool_success",
-            #     "evaluator_name": "builtin.tool_success",
-            #     "initialization_parameters": {
-            #         "deployment_name": f"{model_deployment_name}",
-            #         # "is_reasoning_model": True # if you use an AOAI reasoning model
-            #     },
-            #     "data_mapping": {
-            #         "tool_definitions": "{{item.tool_definitions}}",
-            #         "response": "{{item.response}}"
-            #     },
-            # },
-
-        ]
+        testing_criteria = _get_testing_criteria(model_deployment_name)
 
         print("Creating Eval Group")
         eval_object = client.evals.create(
@@ -215,113 +227,6 @@ with DefaultAzureCredential() as credential:
         print("Eval Run Response:")
         print(eval_object_response)
 
-        query = [
-            # system message is required for task adherence evaluator to examine agent instructions
-            {"role": "system", "content": "You are a weather report agent."},
-            # (optional) prior conversation messages may be included as context for better evaluation accuracy
-            # user message with tool use request
-            {
-                "createdAt": "2025-03-14T08:00:00Z",
-                "role": "user",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "Can you send me an email at your_email@example.com with weather information for Seattle?"
-                    }
-                ],
-            },
-        ]
-
-        # agent's response with tool calls and tool results to resolve the user request
-        response = [
-            {
-                "createdAt": "2025-03-26T17:27:35Z",
-                "run_id": "run_zblZyGCNyx6aOYTadmaqM4QN",
-                "role": "assistant",
-                "content": [
-                    {
-                        "type": "tool_call",
-                        "tool_call_id": "call_CUdbkBfvVBla2YP3p24uhElJ",
-                        "name": "fetch_weather",
-                        "arguments": {"location": "Seattle"},
-                    }
-                ],
-            },
-            {
-                "createdAt": "2025-03-26T17:27:37Z",
-                "run_id": "run_zblZyGCNyx6aOYTadmaqM4QN",
-                "tool_call_id": "call_CUdbkBfvVBla2YP3p24uhElJ",
-                "role": "tool",
-                "content": [{"type": "tool_result", "tool_result": {"weather": "Rainy, 14\u00b0C"}}],
-            },
-            {
-                "createdAt": "2025-03-26T17:27:38Z",
-                "run_id": "run_zblZyGCNyx6aOYTadmaqM4QN",
-                "role": "assistant",
-                "content": [
-                    {
-                        "type": "tool_call",
-                        "tool_call_id": "call_iq9RuPxqzykebvACgX8pqRW2",
-                        "name": "send_email",
-                        "arguments": {
-                            "recipient": "your_email@example.com",
-                            "subject": "Weather Information for Seattle",
-                            "body": "The current weather in Seattle is rainy with a temperature of 14\u00b0C.",
-                        },
-                    }
-                ],
-            },
-            {
-                "createdAt": "2025-03-26T17:27:41Z",
-                "run_id": "run_zblZyGCNyx6aOYTadmaqM4QN",
-                "tool_call_id": "call_iq9RuPxqzykebvACgX8pqRW2",
-                "role": "tool",
-                "content": [
-                    {
-                        "type": "tool_result",
-                        "tool_result": {"message": "Email successfully sent to your_email@example.com."},
-                    }
-                ],
-            },
-            {
-                "createdAt": "2025-03-26T17:27:42Z",
-                "run_id": "run_zblZyGCNyx6aOYTadmaqM4QN",
-                "role": "assistant",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "I have successfully sent you an email with the weather information for Seattle. The current weather is rainy with a temperature of 14\u00b0C.",
-                    }
-                ],
-            },
-        ]
-
-        # tool definitions: schema of tools available to the agent
-        tool_definitions = [
-            {
-                "name": "fetch_weather",
-                "description": "Fetches the weather information for the specified location.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "location": {"type": "string", "description": "The location to fetch weather for."}
-                    },
-                },
-            },
-            {
-                "name": "send_email",
-                "description": "Sends an email with the specified subject and body to the recipient.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "recipient": {"type": "string", "description": "Email address of the recipient."},
-                        "subject": {"type": "string", "description": "Subject of the email."},
-                        "body": {"type": "string", "description": "Body content of the email."},
-                    },
-                },
-            }
-        ]
-
         print("Creating Eval Run with Inline Data")
         eval_run_object = client.evals.runs.create(
             eval_id=eval_object.id,
@@ -334,12 +239,7 @@ with DefaultAzureCredential() as credential:
                     content=[
                         # Conversation format with object types
                         SourceFileContentContent(
-                            item={
-                                "query": query,
-                                "tool_definitions": tool_definitions,
-                                "response": response,
-                                "tool_calls": None, # only needed for tool-focused evaluators if separate from response
-                            }
+                            item=_SAMPLE_ITEM
                         ),
                     ],
                 ),
@@ -356,13 +256,9 @@ with DefaultAzureCredential() as credential:
 
         print("\n\n----Eval Run Output Items----\n\n")
 
-        while True:
-            run = client.evals.runs.retrieve(run_id=eval_run_response.id, eval_id=eval_object.id)
-            if run.status == "completed" or run.status == "failed":
-                output_items = list(client.evals.runs.output_items.list(run_id=run.id, eval_id=eval_object.id))
-                pprint(output_items)
-                print(f"Eval Run Status: {run.status}")
-                print(f"Eval Run Report URL: {run.report_url}")
-                break
-            time.sleep(5)
-            print("Waiting for eval run to complete...")
\ No newline at end of file
+        run = wait_for_completion(client, eval_id=eval_object.id, run_id=eval_run_response.id)
+        # Print items as pages arrive instead of materializing the whole result set
+        for output_item in client.evals.runs.output_items.list(run_id=run.id, eval_id=eval_object.id):
+            pprint(output_item)
+        print(f"Eval Run Status: {run.status}")
+        print(f"Eval Run Report URL: {run.report_url}")
@@ -1,42 +1,72 @@
 import asyncio
-import os
-from random import randint
+import functools
+import logging
+import random
+import sys
 from typing import Annotated
 from urllib import response
 
 from agent_framework import ChatAgent
 from agent_framework.azure import AzureAIAgentClient
-from azure.ai.projects.aio import AIProjectClient
-from azure.identity.aio import AzureCliCredential, DefaultAzureCredential
 from pydantic import Field
-import os
 from azure.ai.evaluation import ToolCallAccuracyEvaluator, AzureOpenAIModelConfiguration
 from azure.ai.evaluation import IntentResolutionEvaluator, TaskAdherenceEvaluator, ResponseCompletenessEvaluator
-from pprint import pprint
+import orjson
 from agent_framework.observability import get_tracer  # setup_observability not available
 from opentelemetry.trace import SpanKind
 from opentelemetry.trace.span import format_trace_id
 
-from dotenv import load_dotenv
+from _clients import get_openai_client, get_project_client, run_and_close
+from _settings import SETTINGS
+from _tracing import init_tracing
 
-# Load environment variables
-load_dotenv()
+init_tracing()
+
+logger = logging.getLogger(__name__)
+
+_CONDITIONS = ("sunny", "cloudy", "rainy", "stormy")
+_randint = random.randint
 
 def get_weather(
     location: Annotated[str, Field(description="The location to get the weather for.")],
 ) -> str:
     """Get the weather for a given location."""
-    conditions = ["sunny", "cloudy", "rainy", "stormy"]
-    return f"The weather in {location} is {conditions[randint(0, 3)]} with a high of {randint(10, 30)}°C."
+    return f"The weather in {location} is {_CONDITIONS[_randint(0, 3)]} with a high of {_randint(10, 30)}°C."
 
 model_config = AzureOpenAIModelConfiguration(
-    azure_endpoint=os.environ["AZURE_OPENAI_ENDPOINT"],
-    api_key=os.environ["AZURE_OPENAI_KEY"],
-    api_version=os.environ["AZURE_OPENAI_API_VERSION"],
-    azure_deployment=os.environ["AZURE_OPENAI_DEPLOYMENT"],
+    azure_endpoint=SETTINGS.azure_openai_endpoint,
+    api_key=SETTINGS.azure_openai_key,
+    api_version=SETTINGS.azure_openai_api_version,
+    azure_deployment=SETTINGS.azure_openai_deployment,
 )
 
 
+# Evaluators are built once per process so their judge clients and connection
+# pools stay warm across runs of main().
+@functools.lru_cache(maxsize=None)
+def _tool_call_accuracy() -> ToolCallAccuracyEvaluator:
+    return ToolCallAccuracyEvaluator(model_config=model_config)
+
+
+@functools.lru_cache(maxsize=None)
+def _response_completeness() -> ResponseCompletenessEvaluator:
+    return ResponseCompletenessEvaluator(model_config=model_config)
+
+
+@functools.lru_cache(maxsize=None)
+def _intent_resolution() -> IntentResolutionEvaluator:
+    return IntentResolutionEvaluator(model_config)
+
+
+@functools.lru_cache(maxsize=None)
+def _task_adherence() -> TaskAdherenceEvaluator:
+    return TaskAdherenceEvaluator(model_config)
+
+
+# In the order main() gathers them, for reporting failures
+_EVALUATOR_NAMES = ("tool_call_accuracy", "response_completeness", "intent_resolution", "task_adherence")
+
+
 
 
 async def main() -> None:
@@ -45,17 +75,20 @@ async def main() -> None:
 
     # Create the client
            
-    credential = DefaultAzureCredential()
-    client = AIProjectClient(endpoint=os.environ["AZURE_AI_PROJECT_ENDPOINT"], credential=credential)
+    client = get_project_client(SETTINGS.azure_ai_project_endpoint)
     deployment = "gpt-4.1"
     # await chat_client.setup_azure_ai_observability()
-    with get_tracer().start_as_current_span("IndCICDAgentEvalRealtime", kind=SpanKind.CLIENT) as current_span:
-            print(f"Trace ID: {format_trace_id(current_span.get_span_context().trace_id)}")
+    # Start the span without making it current: entering a context around
+    # every await below is overhead that the awaited calls don't need.
+    current_span = get_tracer().start_span("IndCICDAgentEvalRealtime", kind=SpanKind.CLIENT)
+    try:
+            span_context = current_span.get_span_context()
+            print(f"Trace ID: {format_trace_id(span_context.trace_id)} (sampled: {span_context.trace_flags.sampled})")
             myAgent = "cicdagenttest"
             created_agent = await client.agents.get(agent_name=myAgent)
             query = "What are the best practices for CI/CD?"
             try:
-                openai_client = client.get_openai_client()
+                openai_client = get_openai_client(SETTINGS.azure_ai_project_endpoint)
 
                 # Reference the agent to get a response
                 response = await openai_client.responses.create(
@@ -66,7 +99,8 @@ async def main() -> None:
                 print("Initial Response Status:", response.status)
                 print("Response ID:", response.id)
                 print("\n" + "="*80 + "\n")
-                result = str(response)
+                # Judge the agent's answer text, not the repr of the whole response object
+                result = response.output_text
 
                 # query = "How is the weather in Seattle ?"
                 tool_call = {
@@ -86,34 +120,42 @@ async def main() -> None:
                     },
                 }
 
-                tool_call_accuracy = ToolCallAccuracyEvaluator(model_config=model_config)
-                response = tool_call_accuracy(query=query, tool_calls=tool_call, tool_definitions=tool_definition)
-                pprint(response)
-                response_completeness_evaluator = ResponseCompletenessEvaluator(model_config=model_config)
-                result = response_completeness_evaluator(
-                    response=result,
-                    ground_truth=result,
-                )
-                pprint(result)
-                intent_resolution_evaluator = IntentResolutionEvaluator(model_config)
-                # Success example. Intent is identified and understood and the response correctly resolves user intent
-                result = intent_resolution_evaluator(
-                    query=query,
-                    response=result,
-                )
-                pprint(result)
-                task_adherence_evaluator = TaskAdherenceEvaluator(model_config)
-                result = task_adherence_evaluator(
-                    query=query,
-                    response=result,
-                )
-                pprint(result)
+                # Each evaluator is an independent judge call over the same response,
+                # so run them concurrently instead of one after another.
+                tool_call_accuracy = _tool_call_accuracy()
+                response_completeness_evaluator = _response_completeness()
+                intent_resolution_evaluator = _intent_resolution()
+                task_adherence_evaluator = _task_adherence()
+
+                tasks = [
+                    asyncio.to_thread(tool_call_accuracy, query=query, tool_calls=tool_call, tool_definitions=tool_definition),
+                    asyncio.to_thread(response_completeness_evaluator, response=result, ground_truth=result),
+                    # Success example. Intent is identified and understood and the response correctly resolves user intent
+                    asyncio.to_thread(intent_resolution_evaluator, query=query, response=result),
+                    asyncio.to_thread(task_adherence_evaluator, query=query, response=result),
+                ]
+                # return_exceptions lets every evaluator finish and be reported before
+                # the first failure is re-raised
+                evaluations = await asyncio.gather(*tasks, return_exceptions=True)
+                failures = []
+                for name, evaluation in zip(_EVALUATOR_NAMES, evaluations):
+                    if isinstance(evaluation, BaseException):
+                        logger.error("%s evaluator failed", name, exc_info=evaluation)
+                        failures.append(evaluation)
+                    elif logger.isEnabledFor(logging.INFO):
+                        logger.info(orjson.dumps(evaluation, option=orjson.OPT_INDENT_2, default=str).decode())
+                if failures:
+                    raise failures[0]
             finally:
                 # Clean up the agent manually
                 pass
                 
                 # await client.agents.delete_agent(created_agent.id)
+    finally:
+        current_span.end()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    logger.setLevel(logging.INFO)
+    asyncio.run(run_and_close(main()))
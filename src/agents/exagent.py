@@ -1,108 +1,116 @@
 # Before running the sample:
-#    pip install --pre azure-ai-projects>=2.0.0b1
+#    pip install --pre "azure-ai-projects>=2.0.0b4"
 #    pip install azure-identity
 
-import re
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
+import asyncio
 from agent_framework.observability import get_tracer  # setup_observability not available
-import os
-from dotenv import load_dotenv
 from opentelemetry.trace import SpanKind
 from opentelemetry.trace.span import format_trace_id
-
-# Load environment variables
-load_dotenv()
-
-myEndpoint = os.getenv("AZURE_AI_PROJECT")
-
-
-
-def existingagent():
+from _clients import get_openai_client, get_project_client, run_and_close
+from _settings import SETTINGS
+from _tracing import init_tracing
+
+init_tracing()
+
+myEndpoint = SETTINGS.azure_ai_project
+
+
+async def _stream_response(stream):
+    """Consume a Responses API event stream.
+
+    Returns the final response along with any MCP approval requests, collected
+    as their output items complete rather than after the whole response.
+    Raises ``RuntimeError`` if the stream reports an error or ends without a
+    terminal response, since there is then no response id to poll.
+    """
+    response = None
+    mcp_approval_requests = []
+    async for event in stream:
+        if event.type == "response.output_item.done" and getattr(event.item, "type", None) == "mcp_approval_request":
+            mcp_approval_requests.append(event.item)
+        elif event.type in ("response.completed", "response.failed", "response.incomplete"):
+            response = event.response
+        elif event.type == "error":
+            raise RuntimeError(f"Response stream error ({event.code}): {event.message}")
+    if response is None:
+        raise RuntimeError("Response stream ended without a completed, failed or incomplete response")
+    return response, mcp_approval_requests
+
+
+async def existingagent():
     # setup_observability()  # Function not available in current agent-framework version
-    project_client = AIProjectClient(
-        endpoint=myEndpoint,
-        credential=DefaultAzureCredential(),
-    )
-
-    def extract_response_text(raw):
-        raw = str(raw)   # <-- ensure it's always a string
-        m = re.search(r"ResponseOutputText\(.*?text='([^']+)'", raw, re.DOTALL)
-        return m.group(1) if m else None
-
+    project_client = get_project_client(myEndpoint)
 
     myAgent = "cicdagenttest"
-    with get_tracer().start_as_current_span("ExistingCICDAgent", kind=SpanKind.CLIENT) as current_span:
-        print(f"Trace ID: {format_trace_id(current_span.get_span_context().trace_id)}")
+    # Ended explicitly instead of held as the current span across each await
+    current_span = get_tracer().start_span("ExistingCICDAgent", kind=SpanKind.CLIENT)
+    try:
+        span_context = current_span.get_span_context()
+        print(f"Trace ID: {format_trace_id(span_context.trace_id)} (sampled: {span_context.trace_flags.sampled})")
         # Get an existing agent
-        agent = project_client.agents.get(agent_name=myAgent)
+        agent = await project_client.agents.get(agent_name=myAgent)
         print(f"Retrieved agent: {agent.name}")
 
-        openai_client = project_client.get_openai_client()
+        openai_client = get_openai_client(myEndpoint)
 
-        # Reference the agent to get a response
-        response = openai_client.responses.create(
+        # Reference the agent to get a response, streaming events so MCP approval
+        # requests are picked up as soon as the server emits them
+        response, mcp_approval_requests = await _stream_response(await openai_client.responses.create(
             input=[{"role": "user", "content": "Summarize the RFP for virginia Railway Express project?"}],
             extra_body={"agent": {"name": agent.name, "type": "agent_reference"}},
-        )
+            stream=True,
+        ))
 
         print("Initial Response Status:", response.status)
         print("Response ID:", response.id)
         print("\n" + "="*80 + "\n")
 
         # Check if there are MCP approval requests
-        mcp_approval_requests = []
-        for output_item in response.output:
-            if hasattr(output_item, 'type') and output_item.type == 'mcp_approval_request':
-                mcp_approval_requests.append(output_item)
-                print(f"MCP Approval Request Found:")
-                print(f"  - ID: {output_item.id}")
-                print(f"  - Tool: {output_item.name}")
-                print(f"  - Server: {output_item.server_label}")
-                print(f"  - Arguments: {output_item.arguments}")
-                print()
+        for output_item in mcp_approval_requests:
+            print(f"MCP Approval Request Found:")
+            print(f"  - ID: {output_item.id}")
+            print(f"  - Tool: {output_item.name}")
+            print(f"  - Server: {output_item.server_label}")
+            print(f"  - Arguments: {output_item.arguments}")
+            print()
 
         # Auto-approve all MCP tool calls
         if mcp_approval_requests:
             print(f"Auto-approving {len(mcp_approval_requests)} MCP tool call(s)...\n")
             
-            # Approve each MCP request by creating a new response with approval
-            for approval_request in mcp_approval_requests:
-                response = openai_client.responses.create(
-                    previous_response_id=response.id,
-                    input=[{
+            # Approve every MCP request in a single response so the approvals cost
+            # one round trip instead of one per request; the stream delivers the
+            # result the moment it is ready
+            response, _ = await _stream_response(await openai_client.responses.create(
+                previous_response_id=response.id,
+                input=[
+                    {
                         "type": "mcp_approval_response",
                         "approve": True,
                         "approval_request_id": approval_request.id
-                    }],
-                    extra_body={"agent": {"name": agent.name, "type": "agent_reference"}}
-                )
+                    }
+                    for approval_request in mcp_approval_requests
+                ],
+                extra_body={"agent": {"name": agent.name, "type": "agent_reference"}},
+                stream=True,
+            ))
+            for approval_request in mcp_approval_requests:
                 print(f"✓ Approved: {approval_request.name}")
             
             print("\n" + "="*80 + "\n")
-            print("Waiting for final response...\n")
-            
-            # Poll for the final result
-            import time
-            max_retries = 30
-            retry_count = 0
-            
-            while retry_count < max_retries:
-                response = openai_client.responses.retrieve(response_id=response.id)
-                
-                if response.status == 'completed':
-                    print("Response completed!")
-                    # print('Result:', response)
-                    break
-                elif response.status == 'failed':
-                    print("Response failed!")
-                    if response.error:
-                        print(f"Error: {response.error}")
-                    break
-                else:
-                    print(f"Status: {response.status} - waiting...")
-                    time.sleep(2)
-                    retry_count += 1
+
+            # The stream only returns once the response is terminal, so there
+            # is nothing left to poll for
+            if response.status == 'completed':
+                print("Response completed!")
+            elif response.status == 'failed':
+                print("Response failed!")
+                if response.error:
+                    print(f"Error: {response.error}")
+            elif response.status == 'incomplete':
+                print("Response incomplete!")
+                if response.incomplete_details:
+                    print(f"Reason: {response.incomplete_details.reason}")
             
             print("\n" + "="*80 + "\n")
 
@@ -165,7 +173,9 @@ def existingagent():
                 print()
 
         print("\n" + "="*80)
+    finally:
+        current_span.end()
     print("End of conversation with agent.")
 
 if __name__ == "__main__":
-    existingagent()
+    asyncio.run(run_and_close(existingagent()))
@@ -14,7 +14,7 @@ USAGE:
 
     Before running the sample:
 
-    pip install "azure-ai-projects>=2.0.0b1" python-dotenv
+    pip install "azure-ai-projects>=2.0.0b4" python-dotenv
 
     Set these environment variables with your own values:
     1) AZURE_AI_PROJECT_ENDPOINT - Required. The Azure AI Project endpoint, as found in the overview page of your
@@ -23,7 +23,13 @@ USAGE:
     3) AZURE_AI_AGENT_NAME - Required. The name of the Agent to perform red teaming evaluation on.
 """
 
+import enum
+import functools
+import logging
+import math
 import os
+import sys
+import types
 
 from dotenv import load_dotenv
 from pprint import pprint
@@ -40,9 +46,13 @@ from azure.ai.projects.models import (
 )
 import json
 import time
+import orjson
 from azure.ai.projects.models import EvaluationTaxonomy
 from typing import Union
 
+from _clients import make_polling_http_client
+from _evals import wait_for_completion
+
 
 def main() -> None:
     load_dotenv()
@@ -57,7 +67,7 @@ def main() -> None:
     with (
         DefaultAzureCredential() as credential,
         AIProjectClient(endpoint=endpoint, credential=credential) as project_client,
-        project_client.get_openai_client() as client,
+        project_client.get_openai_client(http_client=make_polling_http_client()) as client,
     ):
         agent_version = project_client.agents.create_version(
             agent_name=agent_name,
@@ -72,7 +82,7 @@ def main() -> None:
         eval_run_name = f"Red Team Agent Safety Eval Run for {agent_name} -" + str(int(time.time()))
         data_source_config = {"type": "azure_ai_source", "scenario": "red_team"}
 
-        testing_criteria = _get_agent_safety_evaluation_criteria()
+        testing_criteria = [dict(criterion) for criterion in _get_agent_safety_evaluation_criteria()]
         print(f"Defining testing criteria for red teaming for agent target")
         pprint(testing_criteria)
 
@@ -103,8 +113,8 @@ def main() -> None:
         taxonomy_path = os.path.join(data_folder, f"taxonomy_{agent_name}.json")
         # Create the data folder if it doesn't exist
         os.makedirs(data_folder, exist_ok=True)
-        with open(taxonomy_path, "w") as f:
-            f.write(json.dumps(_to_json_primitive(taxonomy), indent=2))
+        with open(taxonomy_path, "wb") as f:
+            f.write(_to_json_bytes(taxonomy))
         print(f"Red teaming Taxonomy created for agent: {agent_name}. Taxonomy written to {taxonomy_path}")
 
         print("Creating red teaming Eval Run")
@@ -131,21 +141,14 @@ def main() -> None:
         print("Eval Run Response:")
         pprint(eval_run_response)
 
-        while True:
-            run = client.evals.runs.retrieve(run_id=eval_run_response.id, eval_id=eval_object.id)
-            if run.status == "completed" or run.status == "failed":
-                output_items = list(client.evals.runs.output_items.list(run_id=run.id, eval_id=eval_object.id))
-                output_items_path = os.path.join(data_folder, f"redteam_eval_output_items_{agent_name}.json")
-                # Create the data folder if it doesn't exist
-                os.makedirs(data_folder, exist_ok=True)
-                with open(output_items_path, "w") as f:
-                    f.write(json.dumps(_to_json_primitive(output_items), indent=2))
-                print(
-                    f"RedTeam Eval Run completed with status: {run.status}. Output items written to {output_items_path}"
-                )
-                break
-            time.sleep(5)
-            print(f"Waiting for eval run to complete... {run.status}")
+        run = wait_for_completion(client, eval_id=eval_object.id, run_id=eval_run_response.id)
+        output_items = client.evals.runs.output_items.list(run_id=run.id, eval_id=eval_object.id)
+        output_items_path = os.path.join(data_folder, f"redteam_eval_output_items_{agent_name}.json")
+        # Create the data folder if it doesn't exist
+        os.makedirs(data_folder, exist_ok=True)
+        with open(output_items_path, "wb") as f:
+            _write_json_array(f, output_items)
+        print(f"RedTeam Eval Run completed with status: {run.status}. Output items written to {output_items_path}")
 
         #client.evals.delete(eval_id=eval_object.id)
         #print("Evaluation deleted")
@@ -154,91 +157,165 @@ def main() -> None:
         #print("Agent deleted")
 
 
+def _describe_tool(tool):
+    if tool["type"] == "openapi":
+        openapi = tool["openapi"]
+        return {"name": openapi["name"], "description": openapi.get("description", "No description provided")}
+    return {
+        "name": tool.get("name", "Unnamed Tool"),
+        "description": tool.get("description", "No description provided"),
+    }
+
+
 def _get_tool_descriptions(agent: AgentVersionObject):
-    tools = agent.definition.get("tools", [])
-    tool_descriptions = []
-    for tool in tools:
-        if tool["type"] == "openapi":
-            tool_descriptions.append(
-                {
-                    "name": tool["openapi"]["name"],
-                    "description": (
-                        tool["openapi"]["description"]
-                        if "description" in tool["openapi"]
-                        else "No description provided"
-                    ),
-                }
-            )
-        else:
-            tool_descriptions.append(
-                {
-                    "name": tool["name"] if "name" in tool else "Unnamed Tool",
-                    "description": tool["description"] if "description" in tool else "No description provided",
-                }
-            )
-
-    return tool_descriptions
-
-
-def _get_agent_safety_evaluation_criteria():
-    return [
-        {
-            "type": "azure_ai_evaluator",
-            "name": "Prohibited Actions",
-            "evaluator_name": "builtin.prohibited_actions",
-            "evaluator_version": "1",
-        },
-        {
-            "type": "azure_ai_evaluator",
-            "name": "Task Adherence",
-            "evaluator_name": "builtin.task_adherence",
-            "evaluator_version": "1",
-        },
-        {
-            "type": "azure_ai_evaluator",
-            "name": "Sensitive Data Leakage",
-            "evaluator_name": "builtin.sensitive_data_leakage",
-            "evaluator_version": "1",
-        },
-        {
-            "type": "azure_ai_evaluator",
-            "name": "Self Harm",
-            "evaluator_name": "builtin.self_harm",
-            "evaluator_version": "1",
-        },
-        {
-            "type": "azure_ai_evaluator",
-            "name": "Violence",
-            "evaluator_name": "builtin.violence",
-            "evaluator_version": "1",
-        },
-        {"type": "azure_ai_evaluator", "name": "Sexual", "evaluator_name": "builtin.sexual", "evaluator_version": "1"},
-        {
-            "type": "azure_ai_evaluator",
-            "name": "Hate Unfairness",
-            "evaluator_name": "builtin.hate_unfairness",
-            "evaluator_version": "1",
-        },
-    ]
-
-
-def _to_json_primitive(obj):
-    if obj is None or isinstance(obj, (str, int, float, bool)):
-        return obj
-    if isinstance(obj, (list, tuple)):
-        return [_to_json_primitive(i) for i in obj]
-    if isinstance(obj, dict):
-        return {k: _to_json_primitive(v) for k, v in obj.items()}
-    for method in ("to_dict", "as_dict", "dict", "serialize"):
-        if hasattr(obj, method):
-            try:
-                return _to_json_primitive(getattr(obj, method)())
-            except Exception:
-                pass
-    if hasattr(obj, "__dict__"):
-        return _to_json_primitive({k: v for k, v in vars(obj).items() if not k.startswith("_")})
+    return [_describe_tool(tool) for tool in agent.definition.get("tools", [])]
+
+
+# (display name, builtin evaluator) pairs for the agent safety criteria
+_AGENT_SAFETY_EVALUATORS = (
+    ("Prohibited Actions", "builtin.prohibited_actions"),
+    ("Task Adherence", "builtin.task_adherence"),
+    ("Sensitive Data Leakage", "builtin.sensitive_data_leakage"),
+    ("Self Harm", "builtin.self_harm"),
+    ("Violence", "builtin.violence"),
+    ("Sexual", "builtin.sexual"),
+    ("Hate Unfairness", "builtin.hate_unfairness"),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_agent_safety_evaluation_criteria(evaluator_version: str = "1"):
+    # Cached per version, so entries are read-only; copy with dict() to modify
+    return tuple(
+        types.MappingProxyType(
+            {
+                "type": "azure_ai_evaluator",
+                "name": name,
+                "evaluator_name": evaluator_name,
+                "evaluator_version": evaluator_version,
+            }
+        )
+        for name, evaluator_name in _AGENT_SAFETY_EVALUATORS
+    )
+
+
+_SERIALIZER_METHODS = ("to_dict", "as_dict", "dict", "serialize")
+# type -> serializer method names the class defines, in preference order
+_SERIALIZER_CACHE = {}
+
+
+# These run once per SDK object during serialization, so the globals and
+# builtins they use are bound as defaults to make them local (LOAD_FAST) reads.
+def _serializers_for(cls, _cache_get=_SERIALIZER_CACHE.get):
+    methods = _cache_get(cls)
+    if methods is None:
+        methods = _SERIALIZER_CACHE[cls] = tuple(m for m in _SERIALIZER_METHODS if getattr(cls, m, None) is not None)
+    return methods
+
+
+# type -> public __slots__ names across the MRO, for objects without a __dict__
+_SLOTS_CACHE = {}
+_MISSING = object()
+
+
+def _public_slots_for(cls, _cache_get=_SLOTS_CACHE.get):
+    names = _cache_get(cls)
+    if names is None:
+        names = []
+        for klass in cls.__mro__:
+            slots = klass.__dict__.get("__slots__", ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name[:1] != "_" and name not in names:
+                    names.append(name)
+        names = _SLOTS_CACHE[cls] = tuple(names)
+    return names
+
+
+def _to_object_value(
+    obj, _type=type, _getattr=getattr, _serializers_for=_serializers_for, _public_slots_for=_public_slots_for
+):
+    # Plain-data view of an SDK object; the caller converts whatever comes back
+    cls = _type(obj)
+    for method in _serializers_for(cls):
+        try:
+            return _getattr(obj, method)()
+        except Exception:
+            pass
+    d = _getattr(obj, "__dict__", None)
+    if d is not None:
+        return {k: v for k, v in d.items() if k[:1] != "_"}
+    slots = _public_slots_for(cls)
+    if slots:
+        # Unset slots are left out, as they would be from a __dict__
+        return {name: value for name in slots if (value := _getattr(obj, name, _MISSING)) is not _MISSING}
     return str(obj)
 
 
+_ORJSON_OPTIONS = (
+    orjson.OPT_INDENT_2
+    | orjson.OPT_NON_STR_KEYS
+    # Route these through _json_default so they serialize as they always have
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+)
+
+
+def _json_default(obj, _to_object_value=_to_object_value):
+    if isinstance(obj, enum.Enum):
+        # orjson writes enums as their value; do the same on the json fallback
+        return obj.value
+    value = _to_object_value(obj)
+    return str(obj) if value is obj else value
+
+
+def _finite(value):
+    # NaN/Infinity as null, the way orjson writes them
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v) for v in value]
+    return value
+
+
+def _to_json_bytes(obj) -> bytes:
+    """Serialize ``obj`` as indented UTF-8 JSON in a single C-level traversal.
+
+    orjson handles lists, dicts and primitives natively and only calls back
+    into Python for SDK objects, which are reduced via ``_to_object_value``.
+    Unlike ``json.dumps``, non-ASCII text is written as-is rather than as
+    ``\\uXXXX`` escapes, NaN/Infinity become ``null`` and enums serialize as
+    their value.
+
+    orjson rejects ints wider than 64 bits, so such an object is retried with
+    the stdlib encoder instead of aborting the whole file. That path writes
+    NaN, Infinity and enums the same way, so every item in a file matches.
+    """
+    try:
+        return orjson.dumps(obj, default=_json_default, option=_ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        return json.dumps(
+            _finite(obj), default=lambda o: _finite(_json_default(o)), indent=2, ensure_ascii=False
+        ).encode()
+
+
+def _write_json_array(f, items):
+    """Write ``items`` to ``f`` as an indented JSON array, one item at a time.
+
+    Items are pulled from the iterable (e.g. a lazy paginator) and written as
+    they arrive, so the full result set is never held in memory.
+    """
+    separator = b"[\n  "
+    for item in items:
+        f.write(separator)
+        # Nest the item one level; raw newlines only occur between JSON tokens
+        f.write(_to_json_bytes(item).replace(b"\n", b"\n  "))
+        separator = b",\n  "
+    f.write(b"[]" if separator == b"[\n  " else b"\n]")
+
+
 if __name__ == "__main__":
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    logging.getLogger("_evals").setLevel(logging.INFO)
     main()
\ No newline at end of file
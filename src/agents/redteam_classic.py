@@ -1,16 +1,59 @@
 import asyncio
 import json
-import os
 from typing import Any, Dict, Optional
 
-from azure.ai.projects import AIProjectClient
 from agent_framework.azure import AzureOpenAIChatClient
 from azure.ai.evaluation.red_team import AttackStrategy, RedTeam, RiskCategory
-from azure.identity import AzureCliCredential, DefaultAzureCredential
-from dotenv import load_dotenv
+from azure.identity import AzureCliCredential
+
+from _clients import get_credential, get_openai_client, get_project_client, run_and_close
+from _settings import SETTINGS
+
+myEndpoint = SETTINGS.azure_ai_project
+
+_RISK_CATEGORIES = (
+    RiskCategory.Violence,
+    RiskCategory.HateUnfairness,
+    RiskCategory.Sexual,
+    RiskCategory.SelfHarm,
+)
+_ATTACK_STRATEGIES = (
+    AttackStrategy.EASY,  # Group of easy complexity attacks
+    AttackStrategy.MODERATE,  # Group of moderate complexity attacks
+    AttackStrategy.CharacterSpace,  # Add character spaces
+    AttackStrategy.ROT13,  # Use ROT13 encoding
+    AttackStrategy.UnicodeConfusable,  # Use confusable Unicode characters
+    AttackStrategy.CharSwap,  # Swap characters in prompts
+    AttackStrategy.Morse,  # Encode prompts in Morse code
+    AttackStrategy.Leetspeak,  # Use Leetspeak
+    AttackStrategy.Url,  # Use URLs in prompts
+    AttackStrategy.Binary,  # Encode prompts in binary
+    AttackStrategy.Compose([AttackStrategy.Base64, AttackStrategy.ROT13]),  # Use two strategies in one attack
+)
+
+
+class AgentProbeDispatcher:
+    """Forwards RedTeam probes to an existing agent with bounded concurrency.
+
+    At most ``max_concurrency`` probes are in flight at once. Rate-limited
+    (429) calls are left to the OpenAI client's own retries, which honor
+    ``Retry-After``.
+    """
+
+    def __init__(self, openai_client, agent_name: str, max_concurrency: int = 10) -> None:
+        self._client = openai_client
+        self._extra_body = {"agent": {"name": agent_name, "type": "agent_reference"}}
+        self._sem = asyncio.Semaphore(max_concurrency)
+
+    async def __call__(self, query: str) -> str:
+        async with self._sem:
+            response = await self._client.responses.create(
+                input=[{"role": "user", "content": query}],
+                extra_body=self._extra_body,
+            )
+        return response.output_text
+
 
-load_dotenv()
-myEndpoint = os.getenv("AZURE_AI_PROJECT")
 async def advanced_callback(messages: Dict, stream: bool = False, session_state: Any = None, context: Optional[Dict] =None) -> dict:
     """A more complex callback that processes conversation history"""
     # Extract the latest message from the conversation history
@@ -37,7 +80,7 @@ async def redteamagent() -> None:
 
     # Initialize Azure credentials
     # credential = AzureCliCredential()
-    credential = DefaultAzureCredential()
+    credential = get_credential()
     # Create the agent
     # Constructor automatically reads from environment variables:
     # AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_DEPLOYMENT_NAME, AZURE_OPENAI_API_KEY
@@ -63,46 +106,39 @@ async def redteamagent() -> None:
     #     """,
     # )
     myAgent = "cicdagenttest"
-    project_client = AIProjectClient(
-        endpoint=myEndpoint,
-        credential=DefaultAzureCredential(),
-    )
-    agent = project_client.agents.get(agent_name=myAgent)
+    project_client = get_project_client(myEndpoint)
+    agent = await project_client.agents.get(agent_name=myAgent)
     print(f"Retrieved agent: {agent.name}")
+    dispatcher = AgentProbeDispatcher(get_openai_client(myEndpoint), agent.name)
     
 
     # Create the callback
-    async def agent_callback(query: str) -> dict[str, list[Any]]:
+    # RedTeam only awaits targets with this messages/stream/session_state/context
+    # signature and reads the reply from "messages"; a plain (query) callable
+    # is called synchronously and its return value used as the response text.
+    async def agent_callback(
+        messages: Dict, stream: bool = False, session_state: Any = None, context: Optional[Dict] = None
+    ) -> dict[str, list[Any]]:
         """Async callback function that interfaces between RedTeam and the agent.
 
         Args:
-            query: The adversarial prompt from RedTeam
+            messages: The conversation so far; the latest message is the adversarial prompt from RedTeam
         """
         try:
-            openai_client = project_client.get_openai_client()
-
+            query = messages[-1].content
             # response = await agent.run(query)
             # Reference the agent to get a response
-            response = openai_client.responses.create(
-                input=[{"role": "user", "content": query}],
-                extra_body={"agent": {"name": agent.name, "type": "agent_reference"}},
-            )
-            return {"messages": [{"content": response.text, "role": "assistant"}]}
+            return {"messages": [{"content": await dispatcher(query), "role": "assistant"}]}
 
         except Exception as e:
             print(f"Error during agent run: {e}")
-            return {"messages": [f"I encountered an error and couldn't process your request: {e!s}"]}
+            return {"messages": [{"content": f"I encountered an error and couldn't process your request: {e!s}", "role": "assistant"}]}
 
     # Create RedTeam instance
     red_team = RedTeam(
-        azure_ai_project=os.environ["AZURE_AI_PROJECT"],
+        azure_ai_project=SETTINGS.azure_ai_project,
         credential=credential,
-        risk_categories=[
-            RiskCategory.Violence,
-            RiskCategory.HateUnfairness,
-            RiskCategory.Sexual,
-            RiskCategory.SelfHarm,
-        ],
+        risk_categories=list(_RISK_CATEGORIES),
         num_objectives=1,  # Small number for quick testing
     )
 
@@ -113,21 +149,9 @@ async def redteamagent() -> None:
 
     # Run the red team evaluation
     results = await red_team.scan(
-        target=advanced_callback,
+        target=agent_callback,
         scan_name="OpenAI-Financial-Advisor",
-        attack_strategies=[
-            AttackStrategy.EASY,  # Group of easy complexity attacks
-            AttackStrategy.MODERATE,  # Group of moderate complexity attacks
-            AttackStrategy.CharacterSpace,  # Add character spaces
-            AttackStrategy.ROT13,  # Use ROT13 encoding
-            AttackStrategy.UnicodeConfusable,  # Use confusable Unicode characters
-            AttackStrategy.CharSwap,  # Swap characters in prompts
-            AttackStrategy.Morse,  # Encode prompts in Morse code
-            AttackStrategy.Leetspeak,  # Use Leetspeak
-            AttackStrategy.Url,  # Use URLs in prompts
-            AttackStrategy.Binary,  # Encode prompts in binary
-            AttackStrategy.Compose([AttackStrategy.Base64, AttackStrategy.ROT13]),  # Use two strategies in one attack
-        ],
+        attack_strategies=list(_ATTACK_STRATEGIES),
         output_path="Financial-Advisor-Redteam-Results.json",
     )
 
@@ -138,4 +162,4 @@ async def redteamagent() -> None:
     print(json.dumps(results.to_scorecard(), indent=2))
 
 if __name__ == "__main__":
-    asyncio.run(redteamagent())
\ No newline at end of file
+    asyncio.run(run_and_close(redteamagent()))
\ No newline at end of file